@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+# ==================================================================== #
+#                                                                      #
+#  Random numbers for the simulation loops, which need single values   #
+#  at every step. Uniform and exponential random numbers are drawn     #
+#  in large blocks from a numpy Generator and handed out one by one,   #
+#  the block is refilled once it is used up.                           #
+#                                                                      #
+#  Falls back to numpy.random.RandomState for numpy versions without   #
+#  the Generator API (< 1.17).                                         #
+#                                                                      #
+# ==================================================================== #
+
+import numpy as np
+
+
+def make_generator(seed = None):
+    # accepts None, an integer seed, an existing Generator/RandomState or a bufferedrng
+    if isinstance(seed,bufferedrng):
+        return seed.get_generator()
+    if isinstance(seed,np.random.RandomState):
+        return seed
+    if hasattr(np.random,"default_rng"):
+        return np.random.default_rng(seed)
+    return np.random.RandomState(seed)
+
+
+def make_bufferedrng(rng = None):
+    # reuse an existing bufferedrng such that its buffers are shared, otherwise create a new one from seed or generator
+    if isinstance(rng,bufferedrng):
+        return rng
+    return bufferedrng(rng)
+
+
+class bufferedrng(object):
+    def __init__(self,seed = None,blocksize = 10000):
+        self.__generator = make_generator(seed)
+        self.__blocksize = int(blocksize)
+
+        # buffers are filled at first use
+        self.__uniformbuffer     = None
+        self.__uniformindex      = self.__blocksize
+        self.__exponentialbuffer = None
+        self.__exponentialindex  = self.__blocksize
+
+
+    def uniform(self,low = 0.,high = 1.):
+        if self.__uniformindex >= self.__blocksize:
+            self.__uniformbuffer = self.__generator.uniform(size = self.__blocksize)
+            self.__uniformindex  = 0
+        u = self.__uniformbuffer[self.__uniformindex]
+        self.__uniformindex += 1
+        return low + (high - low) * u
+
+
+    def exponential(self,scale = 1.):
+        if self.__exponentialindex >= self.__blocksize:
+            self.__exponentialbuffer = self.__generator.standard_exponential(size = self.__blocksize)
+            self.__exponentialindex  = 0
+        e = self.__exponentialbuffer[self.__exponentialindex]
+        self.__exponentialindex += 1
+        return scale * e
+
+
+    def randint(self,high):
+        # single integer from 0 to high-1, using the uniform buffer
+        return min(int(self.uniform() * high),high - 1)
+
+
+    def choice(self,cumulativeweights):
+        # index drawn with weights given as cumulative sum, which does not need to be normalized
+        return min(int(np.searchsorted(cumulativeweights,self.uniform() * cumulativeweights[-1],side = "right")),len(cumulativeweights) - 1)
+
+
+    def get_generator(self):
+        # underlying generator, used directly for draws that are not buffered
+        return self.__generator
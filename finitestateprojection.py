@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+
+# ==================================================================== #
+#                                                                      #
+#  Finite State Projection (FSP) for small networks defined with       #
+#  'reactionsystem'. Instead of averaging over many SSA runs, the      #
+#  chemical master equation                                            #
+#    dp/dt = A p                                                       #
+#  is solved directly on all states reachable from the initial         #
+#  condition within given maximal population sizes.                    #
+#                                                                      #
+#  Reactions leaving the truncated state space are removed from the    #
+#  system, the missing probability 1 - sum(p) is an upper bound for    #
+#  the truncation error.                                               #
+#                                                                      #
+# ==================================================================== #
+
+import numpy as np
+import argparse
+import sys,math
+from collections import deque
+from scipy import sparse
+from scipy.sparse.linalg import expm_multiply
+
+import reactionsystem as rs
+
+class finitestateprojection(object):
+    def __init__(self,system,maxpopulations = 100,maxstates = 1000000):
+        self.__system    = system
+        self.__indexset  = system.get_indexset()
+        self.__numpops   = len(self.__indexset)
+        self.__maxstates = maxstates
+        self.__truncationerror = None
+
+        # maximal population sizes, either the same for all populations or a dict with one entry per population
+        if isinstance(maxpopulations,dict):
+            self.__maxpopulations = np.array([maxpopulations[p] for p in self.__indexset],dtype = int)
+        else:
+            self.__maxpopulations = maxpopulations * np.ones(self.__numpops,dtype = int)
+
+        self.build()
+
+
+    def count(self,populations):
+        # number of occurences of each population in a string
+        return np.array([populations.count(p) for p in self.__indexset],dtype = int)
+
+
+    def build(self):
+        # enumerate all states reachable from the current populations in 'system' and construct the sparse generator
+        # transitions model the time accounting of 'reactionsystem.step()':
+        #   propensity is rate times the product over all populations in coefficients,
+        #   reactions with missing reactants are redrawn in 'step()', but their propensity still enters the total rate
+        #   that sets the waiting time. Thus available reactions fire with their propensity multiplied by
+        #   (total propensity) / (propensity of available reactions). States without available reactions are absorbing.
+        # differences to 'step()':
+        #   a reaction is only available if all reactants are present in the required numbers (e.g. n_A >= 2 for "AA"),
+        #   while 'reactionsystem.isavailable()' only checks that every reactant is non-zero and can yield negative populations
+        stoichiometry = list()
+        for reactants,products,rate,coefficients in self.__system.get_reactions():
+            rcount = self.count(reactants)
+            # reactions without reactants are never available in 'reactionsystem.isavailable()', but count in the total rate
+            available = len(reactants.replace("0","")) > 0
+            stoichiometry.append((available,rcount,self.count(products) - rcount,self.count(coefficients),rate))
+
+        initial = tuple(int(n) for n in self.__system.get_populations(self.__indexset))
+        if np.any(np.array(initial) > self.__maxpopulations):
+            raise ValueError("Initial condition outside of truncated state space")
+
+        states   = [initial]
+        index    = {initial: 0}
+        queue    = deque([initial])
+        diagonal = [0.]
+        rows     = list()
+        cols     = list()
+        values   = list()
+
+        while len(queue) > 0:
+            state = queue.popleft()
+            i     = index[state]
+            n     = np.array(state,dtype = int)
+
+            propensities  = list()
+            totalrate     = 0.
+            availablerate = 0.
+            for available,rcount,change,ccount,rate in stoichiometry:
+                a = rate * np.prod(np.power(n,ccount))
+                totalrate += a
+                if available and np.all(n >= rcount) and a > 0:
+                    availablerate += a
+                    propensities.append((a,change))
+            if availablerate <= 0:
+                continue
+
+            for a,change in propensities:
+                a *= totalrate / availablerate
+                diagonal[i] -= a
+
+                newstate = n + change
+                if np.any(newstate > self.__maxpopulations):
+                    # leaves truncated state space
+                    continue
+                newstate = tuple(int(m) for m in newstate)
+                if not newstate in index:
+                    if len(states) >= self.__maxstates:
+                        raise ValueError("More than %d states in truncated state space"%self.__maxstates)
+                    index[newstate] = len(states)
+                    states.append(newstate)
+                    diagonal.append(0.)
+                    queue.append(newstate)
+                rows.append(index[newstate])
+                cols.append(i)
+                values.append(a)
+
+        numstates       = len(states)
+        self.__states   = np.array(states,dtype = int)
+        self.__index    = index
+        self.__initial  = np.zeros(numstates,dtype = float)
+        self.__initial[0] = 1.
+        rows   = np.concatenate([rows,np.arange(numstates)]).astype(int)
+        cols   = np.concatenate([cols,np.arange(numstates)]).astype(int)
+        values = np.concatenate([values,diagonal])
+        self.__generator  = sparse.coo_matrix((values,(rows,cols)),shape = (numstates,numstates)).tocsc()
+
+
+    def solve(self,times):
+        # probability distributions over all states at the requested times, shape (len(times), number of states)
+        # times need to be non-negative, they are measured from the initial condition
+        times = np.atleast_1d(np.array(times,dtype = float))
+        if np.any(times < 0):
+            raise ValueError("Times have to be non-negative")
+        order = np.argsort(times)
+
+        p             = self.__initial
+        currenttime   = 0.
+        probabilities = np.zeros((len(times),len(p)),dtype = float)
+        for i in order:
+            if times[i] > currenttime:
+                p = expm_multiply((times[i] - currenttime) * self.__generator,p)
+                currenttime = times[i]
+            probabilities[i] = p
+
+        # clip small negative values from numerical errors
+        probabilities[probabilities < 0] = 0
+        self.__truncationerror = 1. - np.sum(probabilities,axis = 1)
+        return probabilities
+
+
+    def marginal(self,probabilities,population):
+        # distribution of a single population from the distributions returned by 'solve()'
+        k = self.__indexset.index(population)
+        probabilities = np.atleast_2d(probabilities)
+        return np.array([np.bincount(self.__states[:,k],weights = p,minlength = self.__maxpopulations[k] + 1) for p in probabilities])
+
+
+    def get_states(self):
+        return self.__states
+
+    def get_generator(self):
+        return self.__generator
+
+    def get_truncation_error(self):
+        # probability that left the truncated state space up to the times of the last call of 'solve()', None before
+        return self.__truncationerror
+
+    def get_numstates(self):
+        return len(self.__states)
+
+
+
+def main():
+    # population size distribution for a single population growing on a substrate, same growth reaction as in 'growthmigration.py'
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-N","--initialcond",type=int,default=25)
+    parser.add_argument("-S","--substrate",type=int,default=100)
+    parser.add_argument("-a","--alpha",type=float,default=1.)
+    parser.add_argument("-t","--times",type=float,nargs="+",default=[1.,2.,5.])
+    args = parser.parse_args()
+
+    r = rs.reactionsystem(indexset = "Aa")
+    r.set_population("A",args.initialcond)
+    r.set_population("a",args.substrate)
+    r.add_reaction("Aa","AA",rate = args.alpha,coefficients = "A")
+    r.print_reactions()
+
+    fsp = finitestateprojection(r,maxpopulations = args.initialcond + args.substrate)
+    p   = fsp.solve(args.times)
+    pA  = fsp.marginal(p,"A")
+    err = fsp.get_truncation_error()
+
+    print "# states: {:d}".format(fsp.get_numstates())
+    for i in range(len(args.times)):
+        print "# time = {:.3f} truncation error = {:.4e}".format(args.times[i],err[i])
+        for n in range(len(pA[i])):
+            if pA[i,n] > 0:
+                print "{:5d} {:.6e}".format(n,pA[i,n])
+        print
+
+if __name__ == "__main__":
+    main()
@@ -20,44 +20,63 @@ parser.add_argument("-n","--initialcond_otherpop",type=int,default=0)
 parser.add_argument("-S","--substrate",type=int,default=10000)
 
 parser.add_argument("-r","--repetitions",type=int,default=10)
-parser.add_argument("-m","--mu",type=float,default=1e-2)
-parser.add_argument("-a","--alpha",type=float,default=1.)
+parser.add_argument("-m","--mu",type=float,nargs="+",default=[1e-2])
+parser.add_argument("-a","--alpha",type=float,nargs="+",default=[1.])
 parser.add_argument("-o","--outputsteps",type=int,default=100)
+parser.add_argument("-R","--seed",type=int,default=None)
 args = parser.parse_args()
 
 assert 2 <= args.populations <= 26,"populations indexed by letters in alphabet..."
 
-r       = rs.reactionsystem(indexset = "Aa")
+# network is built only once, rates are updated in place for every value of alpha and mu
+# reactions are added with rate 1 (add_reaction rejects rates <= 0), actual rates are set before the first repetition
+r       = rs.reactionsystem(indexset = "Aa", rng = args.seed)
 prevn   = "A"
 allpops = "A"
-r.add_reaction("Aa", "AA", rate = args.alpha, coefficients = "A")
-
+reactions      = [("Aa", "AA", 1., "A", "growth_A")]
+growthnames    = ["growth_A"]
+migrationnames = list()
 
 
 for i in range(66,65+args.populations):
     n = chr(i)     # microbial population
     s = chr(i+32)  # consumed substrate
-    r.add_reaction(n+s, n+n, rate = args.alpha, coefficients = n,     permissive = True)  # growth
-    r.add_reaction(n, prevn, rate = args.mu,    coefficients = n,     permissive = True)  # migration to previous deme
-    r.add_reaction(prevn, n, rate = args.mu,    coefficients = prevn, permissive = True)  # migration from previous deme
+    reactions.append((n+s, n+n, 1., n,     "growth_"+n))             # growth
+    reactions.append((n, prevn, 1., n,     "migration_"+n+prevn))    # migration to previous deme
+    reactions.append((prevn, n, 1., prevn, "migration_"+prevn+n))    # migration from previous deme
+    growthnames    += ["growth_"+n]
+    migrationnames += ["migration_"+n+prevn,"migration_"+prevn+n]
     prevn    = n
     allpops += n # keep whole string of all growing populations (for output)
-    
-for rep in range(args.repetitions):
-    r.set_population("A",args.initialcond_firstpop)
-    r.set_population("a",args.substrate)
-    for i in range(66,65+args.populations):
-        n = chr(i)
-        s = chr(i+32)
-        r.set_population(n,args.initialcond_otherpop)
-        r.set_population(s,args.substrate)
-
-    r.set_time(0)
-    o=0
-    while r.is_present("a"):
-        if o%args.outputsteps == 0:
+added = r.add_reactions(reactions, permissive = True)
+assert added == len(reactions),"could only define {:d} of {:d} reactions".format(added,len(reactions))
+
+for alpha in args.alpha:
+    for mu in args.mu:
+        rates = dict()
+        rates.update((name,alpha) for name in growthnames)
+        rates.update((name,mu)    for name in migrationnames)
+        r.set_rates(rates)
+        print "# alpha = {:e} mu = {:e}".format(alpha,mu)
+
+        for rep in range(args.repetitions):
+            r.set_population("A",args.initialcond_firstpop)
+            r.set_population("a",args.substrate)
+            for i in range(66,65+args.populations):
+                n = chr(i)
+                s = chr(i+32)
+                r.set_population(n,args.initialcond_otherpop)
+                r.set_population(s,args.substrate)
+
+            r.set_time(0)
+            o=0
+            while r.is_present("a"):
+                if o%args.outputsteps == 0:
+                    output(r.get_time(),r.get_populations(allpops))
+                o = r.step()
+                if o is None:
+                    # no reaction possible anymore, e.g. for alpha = 0
+                    break
             output(r.get_time(),r.get_populations(allpops))
-        o = r.step()
-    output(r.get_time(),r.get_populations(allpops))
-    print
+            print
     
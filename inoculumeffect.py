@@ -26,6 +26,7 @@ import numpy as np
 import argparse
 import sys
 
+import bufferedrng as brng
 
 
 class inoculumeffect(object):
@@ -52,6 +53,9 @@ class inoculumeffect(object):
         else:
             self.__intermediateoutput = False   
         
+        # random numbers, either from a given seed or generator ('rng'), or freshly seeded
+        self.__rng                  = brng.make_bufferedrng(kwargs.get("rng",kwargs.get("seed",None)))
+
         # coefficients for faster reference instead of computing them every step
         self.__coefficient          = np.array([np.exp(-1./self.__correlation),1. - np.exp(-1./self.__correlation)])
         
@@ -66,7 +70,7 @@ class inoculumeffect(object):
     
     
     def rng(self):
-        return np.random.uniform(low = self.__yieldinterval[0], high = self.__yieldinterval[1])
+        return self.__rng.uniform(low = self.__yieldinterval[0], high = self.__yieldinterval[1])
             
     def newyield(self,xn):
         return self.__coefficient[0] * xn + self.__coefficient[1] * self.rng()
@@ -128,11 +132,11 @@ class inoculumeffect(object):
 
         
         if self.__PoissonSeeding:
-            seedingsize = np.random.poisson(seedingsize)
+            seedingsize = self.__rng.get_generator().poisson(seedingsize)
         
         if seedingsize > 0:
             # set initial conditions
-            self.__population = list(np.random.choice(self.__overnightculture,size = seedingsize))
+            self.__population = list(self.__rng.get_generator().choice(self.__overnightculture,size = seedingsize))
 
             # run until nutrients are out
             while self.add():
@@ -154,11 +158,12 @@ class inoculumeffect(object):
     # add a single cell to the population, return False if not enough substrate anymore
     def add(self,population = "population"):
         # use dict representation of self to chose either "self.__population" or "self.__overnightculture"
-        x  = self.newyield(np.random.choice(self.__dict__["_inoculumeffect__{:s}".format(population)]))
+        cells = self.__dict__["_inoculumeffect__{:s}".format(population)]
+        x  = self.newyield(cells[self.__rng.randint(len(cells))])
         xi = 1./x
         if self.__currentsubstrate > xi:
             self.__currentsubstrate -= xi
-            self.__dict__["_inoculumeffect__{:s}".format(population)].append(x)
+            cells.append(x)
             return True
         else:
             return False
@@ -225,6 +230,7 @@ def main():
     parser.add_argument("-Y","--yieldmax", type = float, default = 1.5)
     
     parser.add_argument("-P","--PoissonSeeding", default = False, action = "store_true")
+    parser.add_argument("-R","--seed",           type = int, default = None)
     
     parser.add_argument("-H","--onlymeanhisto",                      default = False, action = "store_true")
     parser.add_argument("-v","--verbose",                            default = False, action = "store_true")
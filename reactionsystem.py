@@ -5,8 +5,10 @@ import argparse
 import sys,math
 from scipy import stats
 
+import bufferedrng as brng
+
 class reactionsystem:
-    def __init__(self,indexset = ""):
+    def __init__(self,indexset = "",rng = None):
         
         # define populations and set initial conditions =0 for all of them
         self.__indexset = indexset.replace("0","")
@@ -14,17 +16,24 @@ class reactionsystem:
         self.__n        = dict()
         self.set_population(self.__indexset,0,permissive = True)
 
-        # reactions are stored in these arrays
+        # reactions are stored in these lists while the network is built
         # a single first reaction is already stored: "0" -> "0" with rate 0.
-        self.__reactionrates = np.array((0.),dtype = float)
-        self.__reactants     = np.array(("0"),dtype = str)
-        self.__products      = np.array(("0"),dtype = str)
-        self.__coefficients  = np.array(("0"),dtype = str)
+        # lists are converted to arrays once in 'compile()', such that rates can
+        # be updated in place afterwards
+        self.__reactionrates = [0.]
+        self.__reactants     = ["0"]
+        self.__products      = ["0"]
+        self.__coefficients  = ["0"]
+        self.__reactionnames = dict()
         self.__numreactions  = 1
+        self.__compiled      = False
 
         # internal time tracking
         self.__time = 0.
         self.__steps = 0
+
+        # random numbers, 'rng' is either a seed, a numpy generator or a bufferedrng shared with other simulations
+        self.__rng = brng.make_bufferedrng(rng)
     
     
     def load_populations_from_file(self,filename = None,permissive = False):
@@ -43,17 +52,20 @@ class reactionsystem:
             fp = open(filename,"r")
         except:
             raise IOError("Could not load reactions from file '%s'"%filename)
-        for reaction in fp.readline():
+        reactions = list()
+        for reaction in fp.readlines():
             e = reaction.split()
             if len(e) < 2:
                 # skip lines with not at least two entries
                 continue
             elif len(e) == 2:
-                self.add_reaction(e[0],e[1],permissive = permissive)
+                reactions.append((e[0],e[1]))
             elif len(e) == 3:
-                self.add_reaction(e[0],e[1],rate = float(e[2]),permissive = permissive)
+                reactions.append((e[0],e[1],float(e[2])))
             elif len(e) > 3:
-                self.add_reaction(e[0],e[1],rate = float(e[2]),coefficients = e[3],permissive = permissive)
+                reactions.append((e[0],e[1],float(e[2]),e[3]))
+        fp.close()
+        self.add_reactions(reactions,permissive = permissive)
     
     
     def existing_populations(self,populations = "0"):
@@ -83,7 +95,51 @@ class reactionsystem:
                 self.__n[p]      = value
 
     
-    def add_reaction(self,reactants,products,rate = 1.,coefficients = "0",permissive = False):
+    def add_reaction(self,reactants,products,rate = 1.,coefficients = "0",permissive = False,name = None):
+        if (not name is None) and (name in self.__reactionnames):
+            raise ValueError("Reaction '%s' already defined"%name)
+        correctreaction = self.__check_reaction(reactants,products,rate,coefficients,permissive)
+        
+        if correctreaction:
+            # network has to be compiled again before the next step
+            if self.__compiled:
+                self.__reactionrates = list(self.__reactionrates)
+                self.__compiled      = False
+            if not name is None:
+                self.__reactionnames[name] = self.__numreactions
+            self.__reactants.append(reactants)
+            self.__products.append(products)
+            self.__reactionrates.append(float(rate))
+            self.__coefficients.append(coefficients)
+            self.__numreactions += 1
+        
+        return correctreaction
+    
+    
+    def add_reactions(self,reactions,permissive = False):
+        # add many reactions at once, each entry is either a tuple
+        # (reactants, products [, rate [, coefficients [, name]]]) or a dict with the keyword arguments of 'add_reaction'
+        # returns the number of reactions that were added
+        added = 0
+        for reaction in reactions:
+            if isinstance(reaction,dict):
+                kwargs = dict(reaction)
+                kwargs.setdefault("permissive",permissive)
+                a = self.add_reaction(**kwargs)
+            else:
+                reaction = tuple(reaction)
+                if len(reaction) > 4:
+                    a = self.add_reaction(*reaction[:4],permissive = permissive,name = reaction[4])
+                else:
+                    a = self.add_reaction(*reaction,permissive = permissive)
+            if a:
+                added += 1
+        self.compile()
+        return added
+    
+    
+    def __check_reaction(self,reactants,products,rate = 1.,coefficients = "0",permissive = False):
+        # not only a check: with permissive, populations not yet in the indexset are added here
         correctreaction = True
         
         if rate <= 0:
@@ -107,13 +163,61 @@ class reactionsystem:
                 correctreaction = False
             else:
                 self.set_population(cpop[1],0,permissive = True)
-                
-        if correctreaction:
-            self.__reactants     = np.append(self.__reactants,reactants)
-            self.__products      = np.append(self.__products,products)
-            self.__reactionrates = np.append(self.__reactionrates,rate)
-            self.__coefficients  = np.append(self.__coefficients,coefficients)
-            self.__numreactions += 1
+        
+        return correctreaction
+    
+    
+    def compile(self):
+        # convert reaction lists to arrays once, after that rates can be changed in place
+        # coefficient strings are stripped of "0" here, instead of every step
+        if not self.__compiled:
+            self.__reactionrates     = np.array(self.__reactionrates,dtype = float)
+            self.__coefficientsindex = [c.replace("0","") for c in self.__coefficients]
+            self.__compiled          = True
+    
+    
+    def get_reaction_index(self,name):
+        # reactions can be referred to by their name given in 'add_reaction' or directly by their index
+        if isinstance(name,(int,np.integer)) and not isinstance(name,(bool,np.bool_)):
+            if 1 <= name < self.__numreactions:
+                return int(name)
+            raise IndexError("Reaction index %d out of range"%name)
+        if name in self.__reactionnames:
+            return self.__reactionnames[name]
+        raise KeyError("Reaction '%s' not defined"%name)
+    
+    
+    def set_rate(self,name,value):
+        # update rate of a single reaction in place, without rebuilding the network
+        if not (np.isfinite(value) and value >= 0):
+            raise ValueError("Reaction rate has to be finite and non-negative")
+        self.compile()
+        self.__reactionrates[self.get_reaction_index(name)] = value
+    
+    
+    def set_rates(self,rates = None,**kwargs):
+        # update several rates at once:
+        # 'rates' is either a dict {name: rate} or a sequence with one rate for every defined reaction (in order of definition)
+        # additional rates can be given as keyword arguments, name = rate
+        # all rates are checked before any of them is written, such that the network is never only partially updated
+        self.compile()
+        newrates = np.array(self.__reactionrates)
+        if isinstance(rates,dict):
+            kwargs.update(rates)
+        elif not rates is None:
+            rates = np.asarray(rates,dtype = float)
+            if len(rates) != self.__numreactions - 1:
+                raise ValueError("Need %d rates, got %d"%(self.__numreactions - 1,len(rates)))
+            newrates[1:] = rates
+        for name,value in kwargs.items():
+            newrates[self.get_reaction_index(name)] = value
+        if not np.all(np.isfinite(newrates) & (newrates >= 0)):
+            raise ValueError("Reaction rate has to be finite and non-negative")
+        self.__reactionrates[:] = newrates
+    
+    
+    def get_rate(self,name):
+        return self.__reactionrates[self.get_reaction_index(name)]
     
     
     def isavailable(self,populations = "0"):
@@ -133,17 +237,17 @@ class reactionsystem:
     def nextreaction(self):
         # need to build rates from reactionrate and coefficients
         # so far, only linear dependence implemented
-        currentrates = np.zeros(self.__numreactions)
+        self.compile()
+        currentrates = np.array(self.__reactionrates)
         for i in range(self.__numreactions):
-            currentrates[i] = self.__reactionrates[i]
-            for r in self.__coefficients[i].replace("0",""):
+            for r in self.__coefficientsindex[i]:
                 currentrates[i] *= self.__n[r]
                     
         # pick next reaction
-        totalrate = np.sum(currentrates)
+        cumulativerates = np.cumsum(currentrates)
+        totalrate = cumulativerates[-1]
         if totalrate > 0:
-            currentrates /= totalrate
-            nr = np.random.choice(np.arange(self.__numreactions),p = currentrates)
+            nr = self.__rng.choice(cumulativerates)
         else:
             nr = 0
         
@@ -166,7 +270,7 @@ class reactionsystem:
                 self.__n[r] += 1
             
             self.__steps += 1
-            self.__time  += np.random.exponential(1./totalrate)
+            self.__time  += self.__rng.exponential(1./totalrate)
             return self.__steps
         else:
             return None
@@ -190,7 +294,14 @@ class reactionsystem:
     
     def get_step(self):
         return self.__steps
-    
+
+    def get_indexset(self):
+        return self.__indexset
+
+    def get_reactions(self):
+        # list of all defined reactions as tuples (reactants, products, rate, coefficients), without the empty first reaction
+        return [(self.__reactants[i],self.__products[i],float(self.__reactionrates[i]),self.__coefficients[i]) for i in range(1,self.__numreactions)]
+
     def print_reactions(self):
         if self.__numreactions > 1:
             print "# Reactants\tProducts\tRate\tCoefficients"